@@ -1,54 +1,93 @@
-# ems-backend/app/api/deps.py
-
-from typing import Optional
-from fastapi import Depends, HTTPException, status, Security
-from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError, jwt
-from app.core.config import settings
-from app.models import pydantic_models as models
-from app.data.mock_data import MOCK_USER_DB
-
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
-oauth2_scheme_required = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
-http_bearer = HTTPBearer(auto_error=False)
-
-async def get_current_user(token: str = Depends(oauth2_scheme_required)):
-    """Decodes JWT token to get current user."""
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            raise credentials_exception
-        token_data = models.TokenData(email=email)
-    except JWTError:
-        raise credentials_exception
-    
-    user = MOCK_USER_DB.get(token_data.email)
-    if user is None:
-        raise credentials_exception
-    
-    return user
-
-async def get_current_user_optional(
-    credentials: Optional[HTTPAuthorizationCredentials] = Security(http_bearer)
-):
-    """Optional authentication - returns user if token is valid, None otherwise."""
-    if credentials is None:
-        return None
-    
-    token = credentials.credentials
-    try:
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        email: str = payload.get("sub")
-        if email is None:
-            return None
-        token_data = models.TokenData(email=email)
-        user = MOCK_USER_DB.get(token_data.email)
-        return user
-    except (JWTError, KeyError, AttributeError):
-        return None
\ No newline at end of file
+# ems-backend/app/api/deps.py
+
+import hashlib
+import time
+from typing import Optional
+from fastapi import Depends, HTTPException, status, Security
+from fastapi.security import OAuth2PasswordBearer, HTTPBearer, HTTPAuthorizationCredentials
+from jose import JWTError, jwt
+from cachetools import TTLCache
+from app.core.config import settings
+from app.models import pydantic_models as models
+from app.data.mock_data import MOCK_USER_DB
+
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token", auto_error=False)
+oauth2_scheme_required = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
+http_bearer = HTTPBearer(auto_error=False)
+
+# Successful token validations are cached briefly so the HMAC signature
+# check runs once per token per TTL window instead of on every
+# authenticated request. Only successes are cached (a failed validation
+# is never remembered), and the short TTL bounds the revocation window.
+_JWT_CACHE = TTLCache(maxsize=10_000, ttl=30)
+
+
+def _jwt_cache_key(token: str) -> bytes:
+    # Hash the token so the raw credential never sits in the cache
+    return hashlib.sha256(token.encode()).digest()
+
+
+def _cached_user(token: str):
+    """Return the cached user for a token, or None on miss/expiry."""
+    entry = _JWT_CACHE.get(_jwt_cache_key(token))
+    if entry is None:
+        return None
+    user, exp = entry
+    if exp is not None and exp <= time.time():
+        return None
+    return user
+
+
+def _cache_user(token: str, user, payload: dict):
+    _JWT_CACHE[_jwt_cache_key(token)] = (user, payload.get("exp"))
+
+
+async def get_current_user(token: str = Depends(oauth2_scheme_required)):
+    """Decodes JWT token to get current user."""
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    user = _cached_user(token)
+    if user is not None:
+        return user
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            raise credentials_exception
+        token_data = models.TokenData(email=email)
+    except JWTError:
+        raise credentials_exception
+
+    user = MOCK_USER_DB.get(token_data.email)
+    if user is None:
+        raise credentials_exception
+
+    _cache_user(token, user, payload)
+    return user
+
+async def get_current_user_optional(
+    credentials: Optional[HTTPAuthorizationCredentials] = Security(http_bearer)
+):
+    """Optional authentication - returns user if token is valid, None otherwise."""
+    if credentials is None:
+        return None
+
+    token = credentials.credentials
+    user = _cached_user(token)
+    if user is not None:
+        return user
+    try:
+        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
+        email: str = payload.get("sub")
+        if email is None:
+            return None
+        token_data = models.TokenData(email=email)
+        user = MOCK_USER_DB.get(token_data.email)
+        if user is not None:
+            _cache_user(token, user, payload)
+        return user
+    except (JWTError, KeyError, AttributeError):
+        return None
@@ -24,11 +24,15 @@ router = APIRouter()
 # Utility function
 # -----------------------------
 def upsample_profile(hourly_profile, steps_per_hour, num_days):
-    """Upsample hourly data using linear interpolation."""
+    """Upsample hourly data using linear interpolation.
+
+    Returns an ndarray - np.tile handles the day repeat - so callers index
+    and aggregate without boxing thousands of floats into Python lists.
+    """
     hourly_times = np.arange(len(hourly_profile))
     fine_times = np.linspace(0, len(hourly_profile) - 1, len(hourly_profile) * steps_per_hour)
-    upsampled_single_day = np.interp(fine_times, hourly_times, hourly_profile).tolist()
-    return upsampled_single_day * num_days
+    upsampled_single_day = np.interp(fine_times, hourly_times, hourly_profile)
+    return np.tile(upsampled_single_day, num_days)
 
 
 """
@@ -64,6 +68,9 @@ def run_demand_optimization(params, load_profiles_dict, price_profile_24h, solar
         fuel_cell_efficiency_percent = max(0, min(1, float(params.get("fuel_cell_efficiency_percent", 0.60))))  # 0-1
         fuel_cell_om_cost = max(0, float(params.get("fuel_cell_om_cost", 1.5)))  # INR/kWh
         electrolyzer_om_cost = max(0, float(params.get("electrolyzer_om_cost", 0.5)))  # INR/kWh
+
+        # Solver tuning: relative MIP gap, clamped to a sane range
+        mip_rel_gap = max(0.001, min(0.1, float(params.get("mip_rel_gap", 0.02))))
         
         # Curtailment penalties per load (defaults from notebook)
         curtail_penalty = {
@@ -305,10 +312,12 @@ def run_demand_optimization(params, load_profiles_dict, price_profile_24h, solar
     cbc_path = shutil.which('cbc')
     if cbc_path:
         os.environ['COIN_CMD'] = cbc_path
-        solver = COIN_CMD(msg=0, timeLimit=180, gapRel=0.01)
+        solver = COIN_CMD(msg=0, timeLimit=180, gapRel=mip_rel_gap,
+                          options=["presolve on", "cuts on", "heur on"])
         print(f"Using system CBC solver at: {cbc_path}")
     else:
-        solver = PULP_CBC_CMD(msg=0, timeLimit=180, gapRel=0.01)
+        solver = PULP_CBC_CMD(msg=0, timeLimit=180, gapRel=mip_rel_gap,
+                              options=["presolve on", "cuts on", "heur on"])
         print("Using bundled CBC solver")
     model.solve(solver)
     
@@ -640,6 +649,7 @@ async def optimize_demand(
     curtail_penalty_load3: float = Form(18.0),
     curtail_penalty_load4: float = Form(10.0),
     curtail_penalty_load5: float = Form(8.0),
+    mip_rel_gap: float = Form(0.02),
     current_user: Optional[models.User] = Depends(get_current_user_optional)
 ):
     """
@@ -748,7 +758,8 @@ async def optimize_demand(
         "electrolyzer_om_cost": electrolyzer_om_cost,
         "curtail_penalty_load3": curtail_penalty_load3,
         "curtail_penalty_load4": curtail_penalty_load4,
-        "curtail_penalty_load5": curtail_penalty_load5
+        "curtail_penalty_load5": curtail_penalty_load5,
+        "mip_rel_gap": mip_rel_gap
     }
 
     # Run Optimization + Generate Plot
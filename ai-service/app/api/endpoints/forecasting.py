@@ -51,9 +51,11 @@ try:
     if not scaler_path.exists():
         scaler_path = models_dir / "iitgn_energy_forecast_scaler.joblib"
     
-    if model_path.exists() and scaler_path.exists():
+    if model_path.exists():
         iitgn_models["forecast_model"] = joblib.load(model_path)
-        iitgn_models["forecast_scaler"] = joblib.load(scaler_path)
+        # Scaler is optional: models retrained on raw features no
+        # longer ship one (tree splits are scale-invariant)
+        iitgn_models["forecast_scaler"] = joblib.load(scaler_path) if scaler_path.exists() else None
         if info_path.exists():
             with open(info_path, 'r') as f:
                 iitgn_models["forecast_info"] = json.load(f)
@@ -194,8 +196,8 @@ async def forecast_energy(
                     input_df = pd.DataFrame([feature_vector], columns=features_list)
                     input_df = input_df.fillna(0)
                     
-                    # Scale and predict
-                    scaled_features = scaler.transform(input_df)
+                    # Scale (legacy artifacts only) and predict
+                    scaled_features = scaler.transform(input_df) if scaler is not None else input_df
                     prediction = model.predict(scaled_features)[0]
                     
                     # Apply time-of-day pattern
@@ -288,8 +290,8 @@ async def forecast_energy_with_features(
             input_df = pd.DataFrame([feature_vector], columns=features_list)
             input_df = input_df.fillna(0)
             
-            # Scale and predict
-            scaled_features = scaler.transform(input_df)
+            # Scale (legacy artifacts only) and predict
+            scaled_features = scaler.transform(input_df) if scaler is not None else input_df
             prediction = model.predict(scaled_features)[0]
             
             forecast_data.append({
@@ -1,10 +1,11 @@
 # ems-backend/app/api/endpoints/simulations.py
 
-import asyncio
 import random
 from datetime import datetime
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel, Field, field_validator
 import joblib
 import pandas as pd
@@ -13,9 +14,18 @@ import tensorflow as tf
 import xgboost as xgb
 from pathlib import Path
 
+# ONNX Runtime runs the tiny solar LSTM with far less per-call dispatch
+# overhead than TF eager/Keras; optional, falls back to tf.function
+try:
+    import tf2onnx
+    import onnxruntime as ort
+    ONNX_AVAILABLE = True
+except ImportError:
+    ONNX_AVAILABLE = False
+
 from app.models import pydantic_models as models
 from app.api.deps import get_current_user
-from app.data.mock_data import MOCK_RL_SUGGESTIONS
+from app.data.mock_data import MOCK_RL_SUGGESTIONS, MOCK_RL_SUGGESTIONS_BY_ID, PENDING_SUGGESTIONS
 
 # Import RLSuggestionInput from models
 RLSuggestionInput = models.RLSuggestionInput
@@ -63,6 +73,28 @@ class IITGNAnomalyDetectionInput(BaseModel):
 
 # Battery RUL model removed - feature marked as "Coming Soon"
 
+# msgspec decodes the hot predict payloads several times faster than the
+# pydantic validators above and allocates far less; optional — without it
+# the pydantic-typed handlers below are registered unchanged
+try:
+    import msgspec
+
+    class _VibrationPayload(msgspec.Struct):
+        features: List[float]
+
+    class _SolarPayload(msgspec.Struct):
+        sequence: List[List[float]]
+
+    class _MotorFaultPayload(msgspec.Struct):
+        features: List[float]
+
+    _VIBRATION_DECODER = msgspec.json.Decoder(_VibrationPayload)
+    _SOLAR_DECODER = msgspec.json.Decoder(_SolarPayload)
+    _MOTOR_FAULT_DECODER = msgspec.json.Decoder(_MotorFaultPayload)
+    MSGSPEC_AVAILABLE = True
+except ImportError:
+    MSGSPEC_AVAILABLE = False
+
 
 # --- Load ML Models on Startup ---
 
@@ -70,58 +102,117 @@ router = APIRouter()
 models_dir = Path("app/ml-models")
 ml_models = {}
 
-try:
-    # 1. Load Vibration Diagnosis Model (RandomForest)
-    ml_models["vibration_model"] = joblib.load(models_dir / "vibration_model.joblib")
-    ml_models["vibration_scaler"] = joblib.load(models_dir / "vibration_scaler.joblib")
-    ml_models["vibration_label_encoder"] = joblib.load(models_dir / "vibration_label_encoder.joblib")
-    ml_models["vibration_features"] = joblib.load(models_dir / "vibration_model_features.json")
-
-    # 2. Load Solar Forecast Model (LSTM)
-    ml_models["solar_model"] = tf.keras.models.load_model(models_dir / "lstm_solar_forecast_model.keras")
-    ml_models["solar_scaler"] = joblib.load(models_dir / "lstm_solar_scaler.joblib")
-    
-    # 3. Load Motor Fault Diagnosis Model (XGBoost)
-    ml_models["motor_fault_model"] = xgb.XGBClassifier()
-    ml_models["motor_fault_model"].load_model(models_dir / "motor_fault_model.json")
-    ml_models["motor_fault_scaler"] = joblib.load(models_dir / "scaler.joblib")
-    ml_models["motor_fault_label_encoder"] = joblib.load(models_dir / "label_encoder.joblib")
-    
-    print("✅ All ML models loaded successfully.")
-except FileNotFoundError as e:
-    print(f"⚠️  Some ML models not found: {e}. Continuing with available models.")
-    ml_models = {}
 
-# Load IITGN-trained models (optional, trained from real data)
-try:
-    import json
-    # IITGN Energy Forecast Model
-    iitgn_forecast_model_path = models_dir / "iitgn_energy_forecast_model.joblib"
-    iitgn_forecast_scaler_path = models_dir / "iitgn_energy_forecast_scaler.joblib"
-    iitgn_forecast_info_path = models_dir / "iitgn_energy_forecast_info.json"
-    
-    if iitgn_forecast_model_path.exists() and iitgn_forecast_scaler_path.exists():
-        ml_models["iitgn_forecast_model"] = joblib.load(iitgn_forecast_model_path)
-        ml_models["iitgn_forecast_scaler"] = joblib.load(iitgn_forecast_scaler_path)
-        if iitgn_forecast_info_path.exists():
-            with open(iitgn_forecast_info_path, 'r') as f:
-                ml_models["iitgn_forecast_info"] = json.load(f)
-        print("✅ IITGN Energy Forecast Model loaded successfully.")
-    
-    # IITGN Anomaly Detection Model
-    iitgn_anomaly_model_path = models_dir / "iitgn_anomaly_detection_model.joblib"
-    iitgn_anomaly_scaler_path = models_dir / "iitgn_anomaly_detection_scaler.joblib"
-    iitgn_anomaly_info_path = models_dir / "iitgn_anomaly_detection_info.json"
-    
-    if iitgn_anomaly_model_path.exists() and iitgn_anomaly_scaler_path.exists():
-        ml_models["iitgn_anomaly_model"] = joblib.load(iitgn_anomaly_model_path)
-        ml_models["iitgn_anomaly_scaler"] = joblib.load(iitgn_anomaly_scaler_path)
-        if iitgn_anomaly_info_path.exists():
-            with open(iitgn_anomaly_info_path, 'r') as f:
-                ml_models["iitgn_anomaly_info"] = json.load(f)
-        print("✅ IITGN Anomaly Detection Model loaded successfully.")
-except Exception as e:
-    print(f"⚠️  IITGN models not available: {e}. Run training script to generate them.")
+def load_ml_models():
+    """Load model artifacts into `ml_models`.
+
+    Called from the FastAPI startup event so importing this module stays
+    cheap and missing artifacts surface at boot, not on the first request.
+    """
+    try:
+        # 1. Load Vibration Diagnosis Model (RandomForest)
+        ml_models["vibration_model"] = joblib.load(models_dir / "vibration_model.joblib")
+        ml_models["vibration_scaler"] = joblib.load(models_dir / "vibration_scaler.joblib")
+        ml_models["vibration_label_encoder"] = joblib.load(models_dir / "vibration_label_encoder.joblib")
+        ml_models["vibration_features"] = joblib.load(models_dir / "vibration_model_features.json")
+
+        # 2. Load Solar Forecast Model (LSTM)
+        ml_models["solar_model"] = tf.keras.models.load_model(models_dir / "lstm_solar_forecast_model.keras")
+        ml_models["solar_scaler"] = joblib.load(models_dir / "lstm_solar_scaler.joblib")
+        # Direct call wrapped in tf.function with a fixed signature: avoids the
+        # heavy per-call overhead (and retracing) of Model.predict for batch-1
+        # inference in the autoregressive forecast loop.
+        ml_models["solar_predict_fn"] = tf.function(
+            lambda x: ml_models["solar_model"](x, training=False),
+            input_signature=[tf.TensorSpec((1, 24, 2), tf.float32)],
+        )
+        if ONNX_AVAILABLE:
+            try:
+                onnx_path = models_dir / "lstm_solar_forecast_model.onnx"
+                if not onnx_path.exists():
+                    tf2onnx.convert.from_keras(
+                        ml_models["solar_model"],
+                        input_signature=[tf.TensorSpec((1, 24, 2), tf.float32, name="input")],
+                        output_path=str(onnx_path),
+                    )
+                sess = ort.InferenceSession(str(onnx_path), providers=["CPUExecutionProvider"])
+                ml_models["solar_onnx_session"] = sess
+                ml_models["solar_onnx_input"] = sess.get_inputs()[0].name
+                print("✅ Solar LSTM running on ONNX Runtime.")
+            except Exception as e:
+                print(f"⚠️  ONNX conversion failed ({e}); using tf.function path for solar model.")
+        # MinMaxScaler inverse for the power column is just (x - min_) / scale_;
+        # pull the two scalars once so predict_solar can inline it instead of
+        # building a padded 2-column matrix for inverse_transform
+        ml_models["solar_power_scale"] = float(ml_models["solar_scaler"].scale_[1])
+        ml_models["solar_power_min"] = float(ml_models["solar_scaler"].min_[1])
+
+        # 3. Load Motor Fault Diagnosis Model (XGBoost)
+        ml_models["motor_fault_model"] = xgb.XGBClassifier()
+        ml_models["motor_fault_model"].load_model(models_dir / "motor_fault_model.json")
+        ml_models["motor_fault_scaler"] = joblib.load(models_dir / "scaler.joblib")
+        ml_models["motor_fault_label_encoder"] = joblib.load(models_dir / "label_encoder.joblib")
+
+        print("✅ All ML models loaded successfully.")
+    except FileNotFoundError as e:
+        print(f"⚠️  Some ML models not found: {e}. Continuing with available models.")
+        ml_models.clear()
+
+    # Load IITGN-trained models (optional, trained from real data)
+    try:
+        import json
+        # IITGN Energy Forecast Model
+        iitgn_forecast_model_path = models_dir / "iitgn_energy_forecast_model.joblib"
+        iitgn_forecast_scaler_path = models_dir / "iitgn_energy_forecast_scaler.joblib"
+        iitgn_forecast_info_path = models_dir / "iitgn_energy_forecast_info.json"
+
+        if iitgn_forecast_model_path.exists():
+            ml_models["iitgn_forecast_model"] = joblib.load(iitgn_forecast_model_path)
+            # Scaler is optional: models retrained on raw features no
+            # longer ship one (tree splits are scale-invariant)
+            if iitgn_forecast_scaler_path.exists():
+                ml_models["iitgn_forecast_scaler"] = joblib.load(iitgn_forecast_scaler_path)
+            if iitgn_forecast_info_path.exists():
+                with open(iitgn_forecast_info_path, 'r') as f:
+                    ml_models["iitgn_forecast_info"] = json.load(f)
+            print("✅ IITGN Energy Forecast Model loaded successfully.")
+
+        # IITGN Anomaly Detection Model
+        iitgn_anomaly_model_path = models_dir / "iitgn_anomaly_detection_model.joblib"
+        iitgn_anomaly_scaler_path = models_dir / "iitgn_anomaly_detection_scaler.joblib"
+        iitgn_anomaly_info_path = models_dir / "iitgn_anomaly_detection_info.json"
+
+        if iitgn_anomaly_model_path.exists():
+            ml_models["iitgn_anomaly_model"] = joblib.load(iitgn_anomaly_model_path)
+            if iitgn_anomaly_scaler_path.exists():
+                ml_models["iitgn_anomaly_scaler"] = joblib.load(iitgn_anomaly_scaler_path)
+            if iitgn_anomaly_info_path.exists():
+                with open(iitgn_anomaly_info_path, 'r') as f:
+                    ml_models["iitgn_anomaly_info"] = json.load(f)
+            print("✅ IITGN Anomaly Detection Model loaded successfully.")
+    except Exception as e:
+        print(f"⚠️  IITGN models not available: {e}. Run training script to generate them.")
+
+
+def warm_up_models():
+    """Run one dummy inference per model to prime lazy framework state.
+
+    The first call into TF/Keras traces the graph and XGBoost/sklearn warm
+    their thread pools, which would otherwise add seconds to the first user
+    request after boot.
+    """
+    if "solar_onnx_session" in ml_models:
+        ml_models["solar_onnx_session"].run(
+            None, {ml_models["solar_onnx_input"]: np.zeros((1, 24, 2), dtype=np.float32)}
+        )
+    elif "solar_predict_fn" in ml_models:
+        ml_models["solar_predict_fn"](np.zeros((1, 24, 2), dtype=np.float32))
+    if "vibration_model" in ml_models:
+        ml_models["vibration_model"].predict(np.zeros((1, 24)))
+    if "motor_fault_model" in ml_models:
+        ml_models["motor_fault_model"].predict(np.zeros((1, 40)))
+    if ml_models:
+        print("✅ ML models warmed up (first-request tracing done at startup).")
 
 # Battery RUL model loading removed - feature marked as "Coming Soon"
 
@@ -130,77 +221,141 @@ except Exception as e:
 
 @router.post("/simulate", response_model=models.SimulationResult)
 async def run_simulation(params: models.SimulationParams, current_user: models.User = Depends(get_current_user)):
-    await asyncio.sleep(1.0)
     base_cost = 1000 - params.pvCurtail * 10
     base_emissions = 500 - params.pvCurtail * 5
     cost = [base_cost + random.uniform(-50, 50) for _ in range(24)]
     emissions = [base_emissions + random.uniform(-20, 20) for _ in range(24)]
     return {"cost": cost, "emissions": emissions}
 
-@router.post("/predict/vibration", response_model=dict)
-async def predict_vibration(input_data: VibrationInput, current_user: models.User = Depends(get_current_user)):
-    if not ml_models:
-        raise HTTPException(status_code=503, detail="ML models are not available.")
-    
-    input_df = pd.DataFrame([input_data.features], columns=ml_models["vibration_features"])
-    scaled_features = ml_models["vibration_scaler"].transform(input_df)
+# --- Inference bodies shared by both predict registrations ---
+
+def _run_vibration(features):
+    # Raw 2-D array instead of a 1xN DataFrame: skips Index/BlockManager
+    # construction, which dwarfs the scaler math for a single row
+    input_arr = np.asarray(features, dtype=np.float32).reshape(1, -1)
+    scaled_features = ml_models["vibration_scaler"].transform(input_arr)
     prediction_encoded = ml_models["vibration_model"].predict(scaled_features)
     probabilities = ml_models["vibration_model"].predict_proba(scaled_features)
     prediction_decoded = ml_models["vibration_label_encoder"].inverse_transform(prediction_encoded)
     confidence = probabilities[0][prediction_encoded[0]]
-    
+
     return {"prediction": prediction_decoded[0], "confidence": float(confidence)}
 
-@router.post("/predict/solar", response_model=dict)
-async def predict_solar(input_data: SolarInput, current_user: models.User = Depends(get_current_user)):
-    if not ml_models:
-        raise HTTPException(status_code=503, detail="ML models are not available.")
 
-    input_sequence = np.array(input_data.sequence)
+def _run_solar(sequence):
+    input_sequence = np.array(sequence)
     scaled_sequence = ml_models["solar_scaler"].transform(input_sequence)
-    
-    look_back = 24
-    future_predictions_scaled = []
-    current_window = list(scaled_sequence)
-
-    for _ in range(96):
-        input_for_prediction = np.array([current_window[-look_back:]])
-        predicted_power_scaled = ml_models["solar_model"].predict(input_for_prediction, verbose=0)[0][0]
-        future_predictions_scaled.append(predicted_power_scaled)
-        new_step = [0, predicted_power_scaled]
-        current_window.append(new_step)
-
-    dummy_irradiation = np.zeros((len(future_predictions_scaled), 1))
-    predictions_to_inverse = np.hstack([dummy_irradiation, np.array(future_predictions_scaled).reshape(-1, 1)])
-    inversed_predictions = ml_models["solar_scaler"].inverse_transform(predictions_to_inverse)
-    final_forecast = np.maximum(0, inversed_predictions[:, 1]).tolist()
+
+    sess = ml_models.get("solar_onnx_session")
+    if sess is not None:
+        input_name = ml_models["solar_onnx_input"]
+        def step(w):
+            return sess.run(None, {input_name: w})[0][0, 0]
+    else:
+        predict_fn = ml_models["solar_predict_fn"]
+        def step(w):
+            return predict_fn(w).numpy()[0, 0]
+
+    window = np.zeros((1, 24, 2), dtype=np.float32)
+    window[0] = scaled_sequence
+    out = np.empty(96, dtype=np.float32)
+
+    for i in range(96):
+        pred = step(window)
+        out[i] = pred
+        window = np.roll(window, -1, axis=1)
+        window[0, -1] = [0, pred]
+
+    # Inlined MinMaxScaler inverse on the 1-D power column — no dummy
+    # irradiation column or intermediate 96x2 matrices needed
+    inversed = (out - ml_models["solar_power_min"]) / ml_models["solar_power_scale"]
+    final_forecast = np.maximum(0, inversed).tolist()
 
     return {"prediction": final_forecast}
 
-@router.post("/predict/motor-fault", response_model=dict)
-async def predict_motor_fault(input_data: MotorFaultInput, current_user: models.User = Depends(get_current_user)):
-    if not ml_models:
-        raise HTTPException(status_code=503, detail="ML models are not available.")
-    
-    # Since feature names aren't provided, we create a generic DataFrame
-    input_df = pd.DataFrame([input_data.features])
-    
-    # Preprocess (Scale) the data
-    scaled_features = ml_models["motor_fault_scaler"].transform(input_df)
-    
+
+def _run_motor_fault(features):
+    # Preprocess (Scale) the data — raw 2-D array, no DataFrame needed
+    input_arr = np.asarray(features, dtype=np.float32).reshape(1, -1)
+    scaled_features = ml_models["motor_fault_scaler"].transform(input_arr)
+
     # Predict using the XGBoost model
     prediction_encoded = ml_models["motor_fault_model"].predict(scaled_features)
     probabilities = ml_models["motor_fault_model"].predict_proba(scaled_features)
-    
+
     # Post-process (Decode) the output
     prediction_decoded = ml_models["motor_fault_label_encoder"].inverse_transform(prediction_encoded)
-    
+
     # Get confidence score for the predicted class
     confidence = probabilities[0][prediction_encoded[0]]
-    
+
     return {"prediction": prediction_decoded[0], "confidence": float(confidence)}
 
-@router.post("/predict/rl-suggestion", response_model=models.RLSuggestion)
+
+# The predict endpoints return ORJSONResponse directly and declare no
+# response_model: the payloads are trivially shaped dicts, and skipping
+# the pydantic re-validation + jsonable_encoder pass roughly halves the
+# per-request serialization cost. With msgspec installed the raw body is
+# decoded by the prebuilt Struct decoders (several times faster than the
+# pydantic validators) and inference is dispatched explicitly with
+# run_in_threadpool; otherwise the pydantic-typed threadpool handlers
+# are registered instead.
+if MSGSPEC_AVAILABLE:
+    @router.post("/predict/vibration")
+    async def predict_vibration(request: Request, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        try:
+            payload = _VIBRATION_DECODER.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if len(payload.features) != 24:
+            raise HTTPException(status_code=422, detail="features must contain exactly 24 values.")
+        return ORJSONResponse(await run_in_threadpool(_run_vibration, payload.features))
+
+    @router.post("/predict/solar")
+    async def predict_solar(request: Request, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        try:
+            payload = _SOLAR_DECODER.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if len(payload.sequence) != 24 or not all(len(row) == 2 for row in payload.sequence):
+            raise HTTPException(status_code=422, detail="sequence must be 24 timesteps of 2 features.")
+        return ORJSONResponse(await run_in_threadpool(_run_solar, payload.sequence))
+
+    @router.post("/predict/motor-fault")
+    async def predict_motor_fault(request: Request, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        try:
+            payload = _MOTOR_FAULT_DECODER.decode(await request.body())
+        except msgspec.DecodeError as e:
+            raise HTTPException(status_code=422, detail=str(e))
+        if len(payload.features) != 40:
+            raise HTTPException(status_code=422, detail="features must contain exactly 40 values.")
+        return ORJSONResponse(await run_in_threadpool(_run_motor_fault, payload.features))
+else:
+    @router.post("/predict/vibration")
+    def predict_vibration(input_data: VibrationInput, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        return ORJSONResponse(_run_vibration(input_data.features))
+
+    @router.post("/predict/solar")
+    def predict_solar(input_data: SolarInput, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        return ORJSONResponse(_run_solar(input_data.sequence))
+
+    @router.post("/predict/motor-fault")
+    def predict_motor_fault(input_data: MotorFaultInput, current_user: models.User = Depends(get_current_user)):
+        if not ml_models:
+            raise HTTPException(status_code=503, detail="ML models are not available.")
+        return ORJSONResponse(_run_motor_fault(input_data.features))
+
+@router.post("/predict/rl-suggestion")
 async def get_rl_suggestion(input_data: RLSuggestionInput, current_user: models.User = Depends(get_current_user)):
     """
     Simulates an RL agent's decision using a set of smart rules (heuristics).
@@ -251,10 +406,17 @@ async def get_rl_suggestion(input_data: RLSuggestionInput, current_user: models.
     if input_data.site_id not in MOCK_RL_SUGGESTIONS:
         MOCK_RL_SUGGESTIONS[input_data.site_id] = []
     MOCK_RL_SUGGESTIONS[input_data.site_id].insert(0, new_suggestion)
-    
-    return new_suggestion
+    MOCK_RL_SUGGESTIONS_BY_ID.setdefault(input_data.site_id, {})[new_suggestion.id] = new_suggestion
+    PENDING_SUGGESTIONS.setdefault(input_data.site_id, []).insert(0, new_suggestion)
+
+    # Invalidate the cached ask-ai system context (imported lazily to keep
+    # this module free of the LLM stack at import time)
+    from app.api.endpoints.actions import bump_context_version
+    bump_context_version()
+
+    return ORJSONResponse(new_suggestion.model_dump(mode="json"))
 
-@router.post("/predict/iitgn-energy-forecast", response_model=dict)
+@router.post("/predict/iitgn-energy-forecast")
 async def predict_iitgn_energy_forecast(
     input_data: IITGNEnergyForecastInput,
     current_user: models.User = Depends(get_current_user)
@@ -267,7 +429,7 @@ async def predict_iitgn_energy_forecast(
         )
     
     model = ml_models["iitgn_forecast_model"]
-    scaler = ml_models["iitgn_forecast_scaler"]
+    scaler = ml_models.get("iitgn_forecast_scaler")
     info = ml_models.get("iitgn_forecast_info", {})
     features_list = info.get("features", list(input_data.features.keys()))
     
@@ -278,11 +440,11 @@ async def predict_iitgn_energy_forecast(
     # Fill missing values with 0
     input_df = input_df.fillna(0)
     
-    # Scale and predict
-    scaled_features = scaler.transform(input_df)
+    # Scale (legacy artifacts only) and predict
+    scaled_features = scaler.transform(input_df) if scaler is not None else input_df
     prediction = model.predict(scaled_features)[0]
-    
-    return {
+
+    return ORJSONResponse({
         "prediction": float(prediction),
         "target": info.get("target", "energy"),
         "units": "kWh" if "kwh" in info.get("target", "").lower() else "kW",
@@ -291,9 +453,9 @@ async def predict_iitgn_energy_forecast(
             "rmse": info.get("rmse"),
             "r2": info.get("r2")
         }
-    }
+    })
 
-@router.post("/predict/iitgn-anomaly", response_model=dict)
+@router.post("/predict/iitgn-anomaly")
 async def detect_iitgn_anomaly(
     input_data: IITGNAnomalyDetectionInput,
     current_user: models.User = Depends(get_current_user)
@@ -306,7 +468,7 @@ async def detect_iitgn_anomaly(
         )
     
     model = ml_models["iitgn_anomaly_model"]
-    scaler = ml_models["iitgn_anomaly_scaler"]
+    scaler = ml_models.get("iitgn_anomaly_scaler")
     info = ml_models.get("iitgn_anomaly_info", {})
     features_list = info.get("features", list(input_data.features.keys()))
     
@@ -317,19 +479,19 @@ async def detect_iitgn_anomaly(
     # Fill missing values with 0
     input_df = input_df.fillna(0)
     
-    # Scale and predict
-    scaled_features = scaler.transform(input_df)
+    # Scale (legacy artifacts only) and predict
+    scaled_features = scaler.transform(input_df) if scaler is not None else input_df
     prediction = model.predict(scaled_features)[0]
     anomaly_score = model.score_samples(scaled_features)[0]
     
     # -1 means anomaly, 1 means normal
     is_anomaly = prediction == -1
     
-    return {
+    return ORJSONResponse({
         "is_anomaly": bool(is_anomaly),
         "anomaly_score": float(anomaly_score),
         "status": "anomaly" if is_anomaly else "normal",
         "confidence": abs(float(anomaly_score))
-    }
+    })
 
 # Battery RUL prediction endpoints removed - feature marked as "Coming Soon"
\ No newline at end of file
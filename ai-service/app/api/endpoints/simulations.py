@@ -10,11 +10,16 @@ from datetime import datetime # <-- Added datetime import
 
 from app.models import pydantic_models as models
 from app.api.deps import get_current_user
-from app.data.mock_data import MOCK_RL_SUGGESTIONS # <-- Added import for suggestions list
+from app.data.mock_data import MOCK_RL_SUGGESTIONS, MOCK_RL_SUGGESTIONS_BY_ID, PENDING_SUGGESTIONS # <-- Added import for suggestions list
 
-from datetime import datetime, timedelta
+import time
 from app.data.mock_data import LAST_SUGGESTION_ACTION
 
+# Cooldown timestamps are time.monotonic() values written by the
+# accept/reject endpoints in actions.py — cheaper than datetime objects
+# and immune to wall-clock adjustments
+COOLDOWN_SECONDS = 300
+
 #
 # --- Pydantic Models for Smart Simulator Inputs ---
 
@@ -132,10 +137,9 @@ async def get_rl_suggestion(input_data: RLSuggestionInput, current_user: models.
     Simulates an RL agent's decision using a set of smart rules (heuristics).
     """
     
-    cooldown_period = timedelta(minutes=5)
     last_action_time = LAST_SUGGESTION_ACTION.get(input_data.site_id)
 
-    if last_action_time and (datetime.now() - last_action_time) < cooldown_period:
+    if last_action_time and (time.monotonic() - last_action_time) < COOLDOWN_SECONDS:
         # If we are in the cooldown period, do not generate a new suggestion.
         # We can raise an exception that the frontend can ignore.
         raise HTTPException(status_code=204, detail="In suggestion cooldown period.")
@@ -176,5 +180,7 @@ async def get_rl_suggestion(input_data: RLSuggestionInput, current_user: models.
     if input_data.site_id not in MOCK_RL_SUGGESTIONS:
         MOCK_RL_SUGGESTIONS[input_data.site_id] = []
     MOCK_RL_SUGGESTIONS[input_data.site_id].insert(0, new_suggestion)
-    
+    MOCK_RL_SUGGESTIONS_BY_ID.setdefault(input_data.site_id, {})[new_suggestion.id] = new_suggestion
+    PENDING_SUGGESTIONS.setdefault(input_data.site_id, []).insert(0, new_suggestion)
+
     return new_suggestion
\ No newline at end of file
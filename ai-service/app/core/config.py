@@ -1,6 +1,7 @@
 # ems-backend/app/core/config.py
 
 from pydantic_settings import BaseSettings
+from typing import ClassVar
 import os
 
 class Settings(BaseSettings):
@@ -8,6 +9,17 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
+    # Explicit origin list for CORS; a wildcard with credentials is invalid
+    # per spec and makes the middleware rewrite headers on every response.
+    # Override with a comma-separated ALLOWED_ORIGINS in the environment.
+    # ClassVar keeps pydantic-settings from treating it as a field and
+    # JSON-parsing the env var (which is comma-separated, not JSON).
+    ALLOWED_ORIGINS: ClassVar[list] = [
+        origin.strip()
+        for origin in os.getenv(
+            "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173"
+        ).split(",")
+    ]
     class Config:
         env_file = ".env"
 
@@ -82,4 +82,15 @@ MOCK_RL_SUGGESTIONS = {
     ]
 }
 
+# Secondary {site_id: {id: obj}} indexes so endpoints can resolve an alert
+# or suggestion in O(1) instead of scanning the per-site lists. Code that
+# inserts into the lists must keep these in sync.
+MOCK_ALERTS_BY_ID = {site: {a.id: a for a in alerts} for site, alerts in MOCK_ALERTS.items()}
+MOCK_RL_SUGGESTIONS_BY_ID = {site: {s.id: s for s in suggestions} for site, suggestions in MOCK_RL_SUGGESTIONS.items()}
+
+# Per-site list of only the pending suggestions, so reads are O(pending)
+# instead of filtering the whole history. Accept/reject must remove from
+# here; creators must insert alongside the main list.
+PENDING_SUGGESTIONS = {site: [s for s in suggestions if s.status == 'pending'] for site, suggestions in MOCK_RL_SUGGESTIONS.items()}
+
 LAST_SUGGESTION_ACTION = {}
\ No newline at end of file
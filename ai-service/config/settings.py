@@ -3,6 +3,8 @@ Configuration settings for the VidyutAI AI Service.
 """
 
 import os
+from typing import ClassVar
+
 from pydantic_settings import BaseSettings
 
 class Settings(BaseSettings):
@@ -38,6 +40,16 @@ class Settings(BaseSettings):
     ANOMALY_DETECTION_MODEL: str = os.getenv("ANOMALY_DETECTION_MODEL", "isolation_forest_model.pkl")
     PREDICTION_MODEL: str = os.getenv("PREDICTION_MODEL", "energy_prediction_model.pkl")
     
+    # CORS: explicit origin list (comma-separated ALLOWED_ORIGINS env var).
+    # ClassVar keeps pydantic-settings from treating it as a field and
+    # JSON-parsing the env var (which is comma-separated, not JSON).
+    ALLOWED_ORIGINS: ClassVar[list] = [
+        origin.strip()
+        for origin in os.getenv(
+            "ALLOWED_ORIGINS", "http://localhost:3000,http://localhost:5173"
+        ).split(",")
+    ]
+
     # Logging
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
     
@@ -11,6 +11,34 @@ from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
 
+
+def _rolling_mean_std(values: np.ndarray, window: int):
+    """Compute rolling mean and std in one fused O(N) pass.
+
+    Both statistics are derived from shared cumulative sums of x and x**2,
+    so the series is walked once instead of pandas running two independent
+    rolling aggregations. Output matches rolling(window).mean()/.std()
+    (ddof=1), with NaN for the first window-1 positions.
+    """
+    x = np.asarray(values, dtype=np.float64)
+    n = x.size
+    mean = np.full(n, np.nan)
+    std = np.full(n, np.nan)
+    if n < window:
+        return mean, std
+
+    c1 = np.cumsum(np.insert(x, 0, 0.0))
+    c2 = np.cumsum(np.insert(x * x, 0, 0.0))
+    s = c1[window:] - c1[:-window]
+    s2 = c2[window:] - c2[:-window]
+    m = s / window
+    var = (s2 - window * m * m) / (window - 1)
+
+    mean[window - 1:] = m
+    std[window - 1:] = np.sqrt(np.clip(var, 0.0, None))
+    return mean, std
+
+
 class DataProcessor:
     """
     Processes energy data for analysis and model input.
@@ -52,18 +80,22 @@ class DataProcessor:
             # Sort by timestamp
             df = df.sort_values('timestamp')
             
-            # Calculate rolling statistics if enough data
+            # Calculate rolling statistics if enough data (single fused pass)
             if len(df) >= 24:
-                df['rolling_mean_24h'] = df['value'].rolling(window=24).mean()
-                df['rolling_std_24h'] = df['value'].rolling(window=24).std()
+                rolling_mean, rolling_std = _rolling_mean_std(df['value'].to_numpy(), 24)
+                df['rolling_mean_24h'] = rolling_mean
+                df['rolling_std_24h'] = rolling_std
             else:
                 # If not enough data, use simple statistics
                 df['rolling_mean_24h'] = df['value'].mean()
                 df['rolling_std_24h'] = df['value'].std() if len(df) > 1 else 0
             
-            # Fill missing values
-            df = df.fillna(method='ffill').fillna(method='bfill')
-            
+            # Fill missing values in place - df was built inside this
+            # function, so nothing the caller holds is mutated and the
+            # two full-frame fillna copies go away
+            df.ffill(inplace=True)
+            df.bfill(inplace=True)
+
             return df
         
         except Exception as e:
@@ -81,18 +113,32 @@ class DataProcessor:
             DataFrame with extracted features
         """
         try:
-            # Select relevant columns
-            features_df = df[self.feature_columns].copy()
-            
-            # Add any additional engineered features
-            features_df['value_diff'] = features_df['value'] - features_df['rolling_mean_24h']
-            features_df['value_normalized'] = (features_df['value'] - features_df['rolling_mean_24h']) / features_df['rolling_std_24h']
-            features_df['value_normalized'].replace([np.inf, -np.inf], 0, inplace=True)
-            
+            # Build the full feature matrix in one preallocated float32
+            # block instead of inserting columns into a copied frame:
+            # no block-manager consolidation, and half the bytes for the
+            # downstream scaler to stream
+            cols = self.feature_columns
+            base = df[cols].to_numpy(dtype=np.float32)
+            n = base.shape[0]
+            feat = np.empty((n, len(cols) + 2), dtype=np.float32)
+            feat[:, :len(cols)] = base
+
+            # Engineered features, computed on the staged array
+            value = base[:, cols.index('value')]
+            rolling_mean = base[:, cols.index('rolling_mean_24h')]
+            rolling_std = base[:, cols.index('rolling_std_24h')]
+            value_diff = value - rolling_mean
+            feat[:, len(cols)] = value_diff
+            with np.errstate(divide='ignore', invalid='ignore'):
+                value_normalized = value_diff / rolling_std
+            value_normalized[np.isinf(value_normalized)] = 0
+            feat[:, len(cols) + 1] = value_normalized
+
             # One-hot encode categorical features if needed
             # features_df = pd.get_dummies(features_df, columns=['day_of_week'], drop_first=True)
-            
-            return features_df
+
+            feature_names = cols + ['value_diff', 'value_normalized']
+            return pd.DataFrame(feat, columns=feature_names, index=df.index)
         
         except Exception as e:
             logger.error(f"Error in feature extraction: {str(e)}")
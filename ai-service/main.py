@@ -8,6 +8,7 @@ import os
 import logging
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse
 from dotenv import load_dotenv
 
 # Import local modules
@@ -71,12 +72,15 @@ app = FastAPI(
     title="VidyutAI AI Service",
     description="AI-powered analytics for energy management systems",
     version="0.1.0",
+    default_response_class=ORJSONResponse,
 )
 
-# Enable CORS for frontend integration
+# Enable CORS for frontend integration (explicit origins; wildcard with
+# credentials is invalid per the CORS spec)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],
+    allow_origins=settings.ALLOWED_ORIGINS,
+    allow_origin_regex=r"https?://(localhost|127\.0\.0\.1)(:\d+)?",
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -120,7 +124,11 @@ async def startup_event():
     global data_processor, model_manager
     
     logger.info("Starting VidyutAI AI Service...")
-    
+
+    # Groq client construction is deferred out of actions.py import
+    if ACTIONS_AVAILABLE:
+        actions.init_llm()
+
     try:
         # Initialize data processor
         data_processor = DataProcessor()
@@ -139,9 +147,9 @@ async def startup_event():
 async def shutdown_event():
     """Clean up resources on shutdown."""
     logger.info("Shutting down VidyutAI AI Service...")
-    
+
     # Clean up resources here
-    
+
     logger.info("VidyutAI AI Service shut down successfully")
 
 @app.get("/")
@@ -160,9 +168,20 @@ async def health_check():
 
 if __name__ == "__main__":
     import uvicorn
-    
+
     # Get port from environment or use default
     port = int(os.getenv("PORT", 8000))
-    
-    # Run the application
-    uvicorn.run("main:app", host="0.0.0.0", port=port, reload=True)
\ No newline at end of file
+
+    # Auto-reload forks a file watcher and forces the slower default event
+    # loop, so it is opt-in for development only (DEV=1). Production runs
+    # uvloop + httptools with one worker per core unless WORKERS overrides.
+    reload = os.getenv("DEV") == "1"
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=port,
+        workers=1 if reload else int(os.getenv("WORKERS", os.cpu_count())),
+        loop="uvloop",
+        http="httptools",
+        reload=reload,
+    )
\ No newline at end of file